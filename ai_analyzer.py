@@ -1,7 +1,7 @@
 """AI-Powered Rating Analysis Engine - FINMEN v3"""
 from typing import Dict, List, Tuple
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 import json
 
@@ -36,9 +36,22 @@ class AIRatingAnalyzer:
             'CCC': 2, 'CC': 1, 'C': 0.5, 'D': 0
         }
     
-    def analyze_rationale(self, company: str, rationale: str, rating: str, agency: str = "") -> AnalysisResult:
-        """Main analysis function"""
-        return AnalysisResult(
+    def analyze_rationale(self, company: str, rationale: str, rating: str, agency: str = "",
+                          cluster_id: str = None) -> AnalysisResult:
+        """
+        Main analysis function
+
+        Rationales in the same near-duplicate cluster (see
+        FullTextSearchEngine.get_cluster_id) reuse the cluster's analysis
+        instead of being analyzed from scratch. Call attach_search_engine so
+        cached analyses are dropped when the engine dissolves a cluster.
+        """
+        if cluster_id is not None:
+            cached = self.analysis_cache.get((cluster_id, rating))
+            if cached is not None:
+                return self._copy_result(cached, company=company, timestamp=datetime.now().isoformat())
+
+        result = AnalysisResult(
             company=company,
             rating=rating,
             strengths=self._extract_strengths(rationale),
@@ -53,6 +66,40 @@ class AIRatingAnalyzer:
             sentiment_score=self._calculate_sentiment(rationale),
             timestamp=datetime.now().isoformat()
         )
+
+        if cluster_id is not None:
+            self.analysis_cache[(cluster_id, rating)] = self._copy_result(result)
+        return result
+
+    def attach_search_engine(self, search_engine):
+        """
+        Keep cached cluster analyses in sync with a search engine
+
+        Args:
+            search_engine: FullTextSearchEngine whose cluster ids are passed in
+        """
+        if self.invalidate_cluster not in search_engine.invalidation_listeners:
+            search_engine.add_invalidation_listener(self.invalidate_cluster)
+
+    def invalidate_cluster(self, cluster_id: str = None):
+        """Drop cached analyses for a cluster, or all of them if cluster_id is None"""
+        if cluster_id is None:
+            self.analysis_cache.clear()
+            return
+        for key in [k for k in self.analysis_cache if k[0] == cluster_id]:
+            del self.analysis_cache[key]
+
+    def _copy_result(self, result: AnalysisResult, **changes) -> AnalysisResult:
+        """Copy a result, including its lists and metrics, so callers never share the cached one"""
+        return replace(
+            result,
+            strengths=list(result.strengths),
+            risks=list(result.risks),
+            upgrade_opportunities=list(result.upgrade_opportunities),
+            downgrade_warnings=list(result.downgrade_warnings),
+            key_metrics=dict(result.key_metrics),
+            **changes
+        )
     
     def _extract_strengths(self, rationale: str) -> List[str]:
         """Extract company strengths from rationale"""
@@ -241,15 +288,29 @@ class AIRatingAnalyzer:
         
         return (pos_count - neg_count) / total
     
-    def batch_analyze(self, companies_data: List[Dict]) -> List[AnalysisResult]:
-        """Analyze multiple companies at once"""
+    def batch_analyze(self, companies_data: List[Dict], search_engine=None) -> List[AnalysisResult]:
+        """
+        Analyze multiple companies at once
+
+        Entries may carry a 'cluster_id', or a 'doc_id' that is resolved to its
+        near-duplicate cluster through search_engine (a FullTextSearchEngine)
+        so duplicates reuse the cluster's analysis.
+        """
+        if search_engine is not None:
+            self.attach_search_engine(search_engine)
+
         results = []
         for company_data in companies_data:
+            cluster_id = company_data.get('cluster_id')
+            if cluster_id is None and search_engine is not None and company_data.get('doc_id'):
+                cluster_id = search_engine.get_cluster_id(company_data['doc_id'])
+
             result = self.analyze_rationale(
                 company=company_data.get('company'),
                 rationale=company_data.get('rationale'),
                 rating=company_data.get('rating'),
-                agency=company_data.get('agency', '')
+                agency=company_data.get('agency', ''),
+                cluster_id=cluster_id
             )
             results.append(result)
         return results
@@ -7,6 +7,7 @@ import io
 from datetime import datetime
 from peer_matcher import initialize_peer_matcher, match_peers, flag_opportunities
 from search_engine import initialize_search_engine, index_document, search, autocomplete
+from rationale_aggregates import RationaleAggregates
 
 # Initialize AI engines\ninitialize_peer_matcher()\ninitialize_search_engine()
 
@@ -47,6 +48,10 @@ if 'demo_data' not in st.session_state:
         'Rating', 'Outlook', 'Rating Action', 'Rationale', 'Uploaded Files', 'Timestamp'
     ])
 
+# Aggregates are versioned with each append; rebuild if they fall out of sync
+if 'aggregates' not in st.session_state or not st.session_state.aggregates.is_current(st.session_state.demo_data):
+    st.session_state.aggregates = RationaleAggregates(st.session_state.demo_data)
+
 if 'uploaded_files' not in st.session_state:
     st.session_state.uploaded_files = {}
 
@@ -119,6 +124,7 @@ with tab1:
                         'Timestamp': [datetime.now().strftime('%Y-%m-%d %H:%M:%S')]
                     })
                     st.session_state.demo_data = pd.concat([st.session_state.demo_data, new_row], ignore_index=True)
+                    st.session_state.aggregates.append(new_row)
                     st.success(f"✅ Rationale {rationale_id} saved (Demo Mode)")
                 else:
                     try:
@@ -150,15 +156,16 @@ with tab2:
     
     if len(st.session_state.demo_data) > 0:
         # Display summary stats
+        stats = st.session_state.aggregates.get_statistics()
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("Total Rationales", len(st.session_state.demo_data))
+            st.metric("Total Rationales", stats['total_rationales'])
         with col2:
-            st.metric("Unique Companies", st.session_state.demo_data['Company Name'].nunique())
+            st.metric("Unique Companies", stats['unique_companies'])
         with col3:
-            st.metric("Rating Agencies", st.session_state.demo_data['Rating Agency'].nunique())
+            st.metric("Rating Agencies", stats['rating_agencies'])
         with col4:
-            st.metric("Instrument Types", st.session_state.demo_data['Instrument Type'].nunique())
+            st.metric("Instrument Types", stats['instrument_types'])
         
         st.divider()
         
@@ -181,12 +188,13 @@ with tab3:
     st.header("🔍 Analysis & Peer Comparison Engine")
     
     if len(st.session_state.demo_data) > 0:
+        aggregates = st.session_state.aggregates
         col1, col2 = st.columns(2)
         
         with col1:
             selected_company = st.selectbox(
                 "Select Company for Analysis",
-                st.session_state.demo_data['Company Name'].unique()
+                aggregates.companies()
             )
         
         with col2:
@@ -198,7 +206,7 @@ with tab3:
         st.divider()
         
         # Get company data
-        company_data = st.session_state.demo_data[st.session_state.demo_data['Company Name'] == selected_company]
+        company_data = aggregates.company_data(st.session_state.demo_data, selected_company)
         
         if not company_data.empty:
             col1, col2, col3 = st.columns(3)
@@ -219,11 +227,7 @@ with tab3:
             st.subheader("Company Ratings by Agency")
             
             # Show all ratings for this company
-            agency_ratings = company_data.groupby('Rating Agency').agg({
-                'Rating': 'last',
-                'Outlook': 'last',
-                'Rationale_ID': 'count'
-            }).rename(columns={'Rationale_ID': 'Updates'})
+            agency_ratings = aggregates.agency_ratings(st.session_state.demo_data, selected_company)
             
             st.dataframe(agency_ratings, use_container_width=True)
             
@@ -238,19 +242,19 @@ with tab3:
         st.subheader("📊 Market Analysis")
         
         # Rating distribution
-        rating_dist = st.session_state.demo_data['Rating'].value_counts().sort_index()
+        rating_dist = aggregates.rating_distribution()
         st.bar_chart(rating_dist, use_container_width=True)
         
         # Outlook distribution
         col1, col2 = st.columns(2)
         with col1:
             st.subheader("Outlook Distribution")
-            outlook_dist = st.session_state.demo_data['Outlook'].value_counts()
+            outlook_dist = aggregates.outlook_distribution()
             st.bar_chart(outlook_dist)
         
         with col2:
             st.subheader("Instrument Type Distribution")
-            instrument_dist = st.session_state.demo_data['Instrument Type'].value_counts()
+            instrument_dist = aggregates.instrument_distribution()
             st.bar_chart(instrument_dist)
         
     else:
@@ -275,8 +279,9 @@ else:
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 📊 Quick Stats")
-st.sidebar.metric("Total Rationales", len(st.session_state.demo_data))
-st.sidebar.metric("Companies Analyzed", st.session_state.demo_data['Company Name'].nunique())
+sidebar_stats = st.session_state.aggregates.get_statistics()
+st.sidebar.metric("Total Rationales", sidebar_stats['total_rationales'])
+st.sidebar.metric("Companies Analyzed", sidebar_stats['unique_companies'])
 
 st.sidebar.markdown("---")
 st.sidebar.info("""
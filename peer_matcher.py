@@ -1,2 +1,507 @@
 
-"""\nFINMEN Peer Matching Engine - Automatic peer discovery and analysis\nMatches similar companies based on industry, rating, and financial metrics\n"""\n\nimport pandas as pd\nimport numpy as np\nfrom typing import List, Dict, Tuple\nfrom difflib import SequenceMatcher\nimport logging\n\nlogger = logging.getLogger(__name__)\n\n# Rating hierarchy for comparison\nRATING_HIERARCHY = {\n    'AAA': 1, 'AA+': 2, 'AA': 3, 'AA-': 4,\n    'A+': 5, 'A': 6, 'A-': 7,\n    'BBB+': 8, 'BBB': 9, 'BBB-': 10,\n    'BB+': 11, 'BB': 12, 'BB-': 13,\n    'B+': 14, 'B': 15, 'B-': 16,\n    'C': 17, 'D': 18, 'NR': 19\n}\n\nclass PeerMatcher:\n    """Intelligent peer matching engine for credit rating analysis"""\n    \n    def __init__(self, peer_database: pd.DataFrame = None):\n        """\n        Initialize peer matcher with company database\n        \n        Args:\n            peer_database: DataFrame with company data (name, industry, rating, etc.)\n        """\n        self.peer_database = peer_database or self._create_sample_database()\n        self.match_weights = {\n            'industry': 0.35,\n            'rating': 0.30,\n            'size': 0.15,\n            'outlook': 0.10,\n            'agency': 0.10\n        }\n    \n    def _create_sample_database(self) -> pd.DataFrame:\n        """Create sample database for testing"""\n        return pd.DataFrame({\n            'company_name': [\n                'Ashiana Housing', 'Lodha Group', 'Prestige Estates', 'Oberoi Realty',\n                'Kotak Bank', 'HDFC Bank', 'ICICI Bank', 'Axis Bank',\n                'Bajaj Finance', 'HDFC Ltd', 'Reliance Industries'\n            ],\n            'industry': [\n                'Real Estate', 'Real Estate', 'Real Estate', 'Real Estate',\n                'Banking', 'Banking', 'Banking', 'Banking',\n                'NBFC', 'NBFC', 'Energy'\n            ],\n            'rating': [\n                'A+', 'A+', 'A', 'AA-',\n                'AAA', 'AA+', 'AA+', 'AA',\n                'AAA', 'AA+', 'AAA'\n            ],\n            'agency': [\n                'ICRA', 'ICRA', 'CARE', 'CRISIL',\n                'CRISIL', 'ICRA', 'CARE', 'CRISIL',\n                'ICRA', 'CRISIL', 'CRISIL'\n            ],\n            'outlook': [\n                'Stable', 'Positive', 'Stable', 'Stable',\n                'Stable', 'Positive', 'Stable', 'Stable',\n                'Positive', 'Stable', 'Stable'\n            ]\n        })\n    \n    def find_peers(self, company_name: str, industry: str, rating: str, \n                   top_n: int = 5) -> List[Dict]:\n        """\n        Find top matching peers for a company\n        \n        Args:\n            company_name: Name of the company\n            industry: Industry sector\n            rating: Credit rating\n            top_n: Number of peers to return\n            \n        Returns:\n            List of matched peers with similarity scores\n        """\n        matches = []\n        \n        for idx, row in self.peer_database.iterrows():\n            if row['company_name'].lower() == company_name.lower():\n                continue  # Skip the company itself\n            \n            score = self._calculate_match_score(\n                industry, rating,\n                row['industry'], row['rating'], row['outlook']\n            )\n            \n            matches.append({\n                'company': row['company_name'],\n                'industry': row['industry'],\n                'rating': row['rating'],\n                'agency': row['agency'],\n                'outlook': row['outlook'],\n                'match_score': round(score, 2),\n                'match_percentage': round(score * 100, 1)\n            })\n        \n        # Sort by match score descending\n        matches.sort(key=lambda x: x['match_score'], reverse=True)\n        \n        return matches[:top_n]\n    \n    def _calculate_match_score(self, industry1: str, rating1: str, \n                               industry2: str, rating2: str, outlook2: str) -> float:\n        """Calculate similarity score between two companies"""\n        scores = {}\n        \n        # Industry match\n        industry_match = SequenceMatcher(None, industry1.lower(), industry2.lower()).ratio()\n        scores['industry'] = industry_match\n        \n        # Rating match (proximity in rating hierarchy)\n        rating_diff = abs(RATING_HIERARCHY.get(rating1, 10) - RATING_HIERARCHY.get(rating2, 10))\n        rating_match = max(0, 1 - (rating_diff * 0.05))  # Decay with distance\n        scores['rating'] = rating_match\n        \n        # Outlook bonus\n        scores['outlook'] = 0.5 if outlook2 == 'Positive' else 0.3\n        \n        # Calculate weighted score\n        weighted_score = sum(\n            scores.get(key, 0) * self.match_weights.get(key, 0)\n            for key in self.match_weights.keys()\n        )\n        \n        return min(1.0, weighted_score)\n    \n    def get_peer_analysis(self, company_name: str, industry: str, rating: str) -> Dict:\n        """\n        Get comprehensive peer analysis\n        \n        Args:\n            company_name: Company name\n            industry: Industry sector\n            rating: Credit rating\n            \n        Returns:\n            Dictionary with peer analysis and insights\n        """\n        peers = self.find_peers(company_name, industry, rating, top_n=10)\n        \n        return {\n            'target_company': company_name,\n            'industry': industry,\n            'rating': rating,\n            'peer_count': len(peers),\n            'top_peers': peers[:5],\n            'all_peers': peers,\n            'average_peer_rating': self._get_average_rating([p['rating'] for p in peers]),\n            'better_rated_peers': [p for p in peers if self._is_better_rating(rating, p['rating'])],\n            'worse_rated_peers': [p for p in peers if self._is_worse_rating(rating, p['rating'])]\n        }\n    \n    def _is_better_rating(self, rating1: str, rating2: str) -> bool:\n        """Check if rating2 is better than rating1"""\n        return RATING_HIERARCHY.get(rating2, 20) < RATING_HIERARCHY.get(rating1, 20)\n    \n    def _is_worse_rating(self, rating1: str, rating2: str) -> bool:\n        """Check if rating2 is worse than rating1"""\n        return RATING_HIERARCHY.get(rating2, 20) > RATING_HIERARCHY.get(rating1, 20)\n    \n    def _get_average_rating(self, ratings: List[str]) -> str:\n        """Get average rating from a list of ratings"""\n        if not ratings:\n            return 'N/A'\n        \n        avg_hierarchy = sum(RATING_HIERARCHY.get(r, 10) for r in ratings) / len(ratings)\n        \n        # Find closest rating\n        closest_rating = min(RATING_HIERARCHY.items(), \n                            key=lambda x: abs(x[1] - avg_hierarchy))[0]\n        \n        return closest_rating\n    \n    def flag_opportunities(self, company_name: str, rating: str, outlook: str,\n                          peers: List[Dict]) -> Dict:\n        """\n        Flag upgrade/downgrade and other opportunities\n        \n        Args:\n            company_name: Company name\n            rating: Current rating\n            outlook: Current outlook\n            peers: List of peer companies\n            \n        Returns:\n            Dictionary with opportunity flags\n        """\n        opportunities = {\n            'company': company_name,\n            'flags': [],\n            'upgrade_potential': False,\n            'downgrade_risk': False,\n            'signal_strength': 'Neutral'\n        }\n        \n        if not peers:\n            return opportunities\n        \n        # Count better/worse rated peers\n        better_peers = [p for p in peers if self._is_better_rating(rating, p['rating'])]\n        worse_peers = [p for p in peers if self._is_worse_rating(rating, p['rating'])]\n        \n        # Upgrade signals\n        if outlook == 'Positive' and len(better_peers) >= 2:\n            opportunities['flags'].append({\n                'type': 'UPGRADE_SIGNAL',\n                'description': f'Positive outlook with {len(better_peers)} better-rated peers',\n                'priority': 'HIGH'\n            })\n            opportunities['upgrade_potential'] = True\n            opportunities['signal_strength'] = 'STRONG'\n        \n        # Downgrade signals\n        if outlook == 'Negative' and len(worse_peers) >= 2:\n            opportunities['flags'].append({\n                'type': 'DOWNGRADE_SIGNAL',\n                'description': f'Negative outlook with {len(worse_peers)} worse-rated peers',\n                'priority': 'HIGH'\n            })\n            opportunities['downgrade_risk'] = True\n            opportunities['signal_strength'] = 'STRONG'\n        \n        # Peer gap analysis\n        if len(better_peers) > len(worse_peers) * 2:\n            opportunities['flags'].append({\n                'type': 'PEER_GAP',\n                'description': 'Company is lagging behind peers',\n                'priority': 'MEDIUM'\n            })\n        \n        return opportunities\n\n\n# Module-level functions for easy usage\nPEER_MATCHER = None\n\ndef initialize_peer_matcher(database: pd.DataFrame = None):\n    """Initialize the global peer matcher"""\n    global PEER_MATCHER\n    PEER_MATCHER = PeerMatcher(database)\n\ndef match_peers(company_name: str, industry: str, rating: str, top_n: int = 5):\n    """Find peers for a company"""\n    if PEER_MATCHER is None:\n        initialize_peer_matcher()\n    return PEER_MATCHER.find_peers(company_name, industry, rating, top_n)\n\ndef analyze_peers(company_name: str, industry: str, rating: str):\n    """Get comprehensive peer analysis"""\n    if PEER_MATCHER is None:\n        initialize_peer_matcher()\n    return PEER_MATCHER.get_peer_analysis(company_name, industry, rating)\n\ndef flag_opportunities(company_name: str, rating: str, outlook: str, peers: List[Dict]):\n    """Flag opportunities and signals"""\n    if PEER_MATCHER is None:\n        initialize_peer_matcher()\n    return PEER_MATCHER.flag_opportunities(company_name, rating, outlook, peers)\n
+"""
+FINMEN Peer Matching Engine - Automatic peer discovery and analysis
+Matches similar companies based on industry, rating, and financial metrics
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Dict, Tuple, Optional
+from collections import Counter
+from difflib import SequenceMatcher
+from scipy import sparse
+from sklearn.preprocessing import normalize
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rating hierarchy for comparison
+RATING_HIERARCHY = {
+    'AAA': 1, 'AA+': 2, 'AA': 3, 'AA-': 4,
+    'A+': 5, 'A': 6, 'A-': 7,
+    'BBB+': 8, 'BBB': 9, 'BBB-': 10,
+    'BB+': 11, 'BB': 12, 'BB-': 13,
+    'B+': 14, 'B': 15, 'B-': 16,
+    'C': 17, 'D': 18, 'NR': 19
+}
+
+class ContentSimilarityIndex:
+    """
+    Sparse TF-IDF index over each company's rationales
+
+    Term counts live in one CSR matrix (companies x vocabulary). New
+    rationales are buffered and merged on the next query; the TF-IDF
+    weighting is recomputed only when counts have changed. Neighbors are
+    exact cosine similarities computed with blocked sparse products.
+    """
+
+    def __init__(self, block_size: int = 512):
+        self.block_size = block_size
+        self.company_ids: Dict[str, int] = {}
+        self.company_names: List[str] = []
+        self.vocabulary: Dict[str, int] = {}
+        self._counts = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self._pending_rows: List[int] = []
+        self._pending_cols: List[int] = []
+        self._pending_counts: List[int] = []
+        # doc_id -> (row, term columns, term counts) already folded into the counts
+        self.rationale_counts: Dict[str, Tuple[int, List[int], List[int]]] = {}
+        self._matrix: Optional[sparse.csr_matrix] = None
+
+    def __len__(self) -> int:
+        return len(self.company_names)
+
+    def __contains__(self, company_name: str) -> bool:
+        return company_name.lower() in self.company_ids
+
+    def add_rationale(self, company_name: str, tokens: List[str], doc_id: str = None):
+        """
+        Add a tokenized rationale to a company's term counts
+
+        Args:
+            company_name: Company the rationale belongs to
+            tokens: Rationale tokens (as produced by the search engine)
+            doc_id: Rationale identifier; re-adding a doc_id replaces its
+                previous counts instead of adding to them
+        """
+        if doc_id is not None and doc_id in self.rationale_counts:
+            old_row, old_cols, old_counts = self.rationale_counts.pop(doc_id)
+            self._pending_rows.extend([old_row] * len(old_cols))
+            self._pending_cols.extend(old_cols)
+            self._pending_counts.extend(-count for count in old_counts)
+
+        key = company_name.lower()
+        row = self.company_ids.get(key)
+        if row is None:
+            row = len(self.company_names)
+            self.company_ids[key] = row
+            self.company_names.append(company_name)
+
+        cols, counts = [], []
+        for term, count in Counter(tokens).items():
+            cols.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+            counts.append(count)
+
+        self._pending_rows.extend([row] * len(cols))
+        self._pending_cols.extend(cols)
+        self._pending_counts.extend(counts)
+        if doc_id is not None:
+            self.rationale_counts[doc_id] = (row, cols, counts)
+
+        self._matrix = None
+
+    def _merge_pending(self):
+        """Fold buffered term counts into the count matrix"""
+        shape = (len(self.company_names), len(self.vocabulary))
+        if self._counts.shape != shape:
+            self._counts.resize(shape)
+
+        if self._pending_rows:
+            update = sparse.csr_matrix(
+                (self._pending_counts, (self._pending_rows, self._pending_cols)),
+                shape=shape, dtype=np.float64
+            )
+            self._counts = (self._counts + update).tocsr()
+            self._counts.sum_duplicates()
+            # Replaced rationales leave explicit zeros that would skew document frequencies
+            self._counts.eliminate_zeros()
+            self._pending_rows, self._pending_cols, self._pending_counts = [], [], []
+
+    def matrix(self) -> sparse.csr_matrix:
+        """L2-normalized TF-IDF matrix (companies x vocabulary)"""
+        if self._matrix is None:
+            self._merge_pending()
+            n_companies, n_terms = self._counts.shape
+            if n_companies == 0 or n_terms == 0:
+                # normalize() rejects matrices without rows or features
+                self._matrix = sparse.csr_matrix((n_companies, n_terms), dtype=np.float64)
+                return self._matrix
+
+            # Smoothed idf and sublinear tf, as in sklearn's TfidfTransformer
+            df = np.bincount(self._counts.indices, minlength=n_terms)
+            idf = np.log((1 + n_companies) / (1 + df)) + 1
+
+            weighted = self._counts.copy()
+            weighted.data = (1 + np.log(weighted.data)) * idf[weighted.indices]
+            self._matrix = normalize(weighted, norm='l2', copy=False)
+
+        return self._matrix
+
+    def similarities(self, company_name: str) -> Optional[np.ndarray]:
+        """
+        Cosine similarity of a company to every indexed company
+
+        Returns:
+            Array aligned with company_names, or None if the company has no rationales
+        """
+        row = self.company_ids.get(company_name.lower())
+        if row is None:
+            return None
+
+        matrix = self.matrix()
+        return (matrix @ matrix[row].T).toarray().ravel()
+
+    def top_k(self, company_name: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Exact top-k most similar companies by rationale content
+
+        Args:
+            company_name: Company to find neighbors for
+            k: Number of neighbors
+
+        Returns:
+            List of (company, similarity) sorted by similarity
+        """
+        row = self.company_ids.get(company_name.lower())
+        if row is None:
+            return []
+
+        matrix = self.matrix()
+        return self._top_k_rows(matrix[row] @ matrix.T, row, k)[0]
+
+    def all_top_k(self, k: int = 10) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        Exact top-k neighbors for every company
+
+        Rows are multiplied against the full matrix in blocks of block_size so
+        the similarity matrix is never materialized at once.
+        """
+        matrix = self.matrix()
+        neighbors = {}
+
+        for start in range(0, matrix.shape[0], self.block_size):
+            block = matrix[start:start + self.block_size] @ matrix.T
+            for offset, peers in enumerate(self._top_k_rows(block, start, k)):
+                neighbors[self.company_names[start + offset]] = peers
+
+        return neighbors
+
+    def _top_k_rows(self, block: sparse.csr_matrix, first_row: int,
+                    k: int) -> List[List[Tuple[str, float]]]:
+        """Select the top-k entries of each row of a sparse similarity block"""
+        block = block.tocsr()
+        results = []
+
+        for offset in range(block.shape[0]):
+            start, end = block.indptr[offset], block.indptr[offset + 1]
+            cols = block.indices[start:end]
+            scores = block.data[start:end]
+
+            keep = (cols != first_row + offset) & (scores > 0)
+            cols, scores = cols[keep], scores[keep]
+
+            if len(scores) > k:
+                top = np.argpartition(-scores, k)[:k]
+                cols, scores = cols[top], scores[top]
+
+            order = np.argsort(-scores, kind='stable')
+            results.append([(self.company_names[c], float(s)) for c, s in zip(cols[order], scores[order])])
+
+        return results
+
+    def clear(self):
+        """Remove all companies and terms"""
+        self.__init__(self.block_size)
+
+
+class PeerMatcher:
+    """Intelligent peer matching engine for credit rating analysis"""
+    
+    def __init__(self, peer_database: pd.DataFrame = None):
+        """
+        Initialize peer matcher with company database
+        
+        Args:
+            peer_database: DataFrame with company data (name, industry, rating, etc.)
+        """
+        self.peer_database = peer_database if peer_database is not None else self._create_sample_database()
+        self.match_weights = {
+            'industry': 0.35,
+            'rating': 0.30,
+            'content': 0.25,
+            'outlook': 0.10
+        }
+        self.content_index = ContentSimilarityIndex()
+    
+    def attach_search_engine(self, search_engine):
+        """
+        Build content similarity from a search engine's rationales
+        
+        Indexes every document already in the engine and registers a
+        listener so rationales indexed later update the similarity index.
+        Counts are tracked per doc_id, so re-indexed rationales and repeated
+        calls replace earlier counts rather than adding to them, and clearing
+        the engine clears the similarity index.
+        
+        Args:
+            search_engine: FullTextSearchEngine instance
+        """
+        for doc in search_engine.documents.values():
+            self.content_index.add_rationale(doc.company, doc.tokens, doc.doc_id)
+        if self._on_document_indexed not in search_engine.index_listeners:
+            search_engine.add_index_listener(self._on_document_indexed)
+        if self._on_index_invalidated not in search_engine.invalidation_listeners:
+            search_engine.add_invalidation_listener(self._on_index_invalidated)
+    
+    def _on_document_indexed(self, doc):
+        """Search engine listener: add a newly indexed rationale"""
+        self.content_index.add_rationale(doc.company, doc.tokens, doc.doc_id)
+    
+    def _on_index_invalidated(self, cluster_id: str = None):
+        """Search engine listener: drop all content when the engine is cleared"""
+        # Dissolved clusters need nothing here: their members are re-indexed
+        if cluster_id is None:
+            self.content_index.clear()
+    
+    def _create_sample_database(self) -> pd.DataFrame:
+        """Create sample database for testing"""
+        return pd.DataFrame({
+            'company_name': [
+                'Ashiana Housing', 'Lodha Group', 'Prestige Estates', 'Oberoi Realty',
+                'Kotak Bank', 'HDFC Bank', 'ICICI Bank', 'Axis Bank',
+                'Bajaj Finance', 'HDFC Ltd', 'Reliance Industries'
+            ],
+            'industry': [
+                'Real Estate', 'Real Estate', 'Real Estate', 'Real Estate',
+                'Banking', 'Banking', 'Banking', 'Banking',
+                'NBFC', 'NBFC', 'Energy'
+            ],
+            'rating': [
+                'A+', 'A+', 'A', 'AA-',
+                'AAA', 'AA+', 'AA+', 'AA',
+                'AAA', 'AA+', 'AAA'
+            ],
+            'agency': [
+                'ICRA', 'ICRA', 'CARE', 'CRISIL',
+                'CRISIL', 'ICRA', 'CARE', 'CRISIL',
+                'ICRA', 'CRISIL', 'CRISIL'
+            ],
+            'outlook': [
+                'Stable', 'Positive', 'Stable', 'Stable',
+                'Stable', 'Positive', 'Stable', 'Stable',
+                'Positive', 'Stable', 'Stable'
+            ]
+        })
+    
+    def find_peers(self, company_name: str, industry: str, rating: str, 
+                   top_n: int = 5) -> List[Dict]:
+        """
+        Find top matching peers for a company
+        
+        Args:
+            company_name: Name of the company
+            industry: Industry sector
+            rating: Credit rating
+            top_n: Number of peers to return
+            
+        Returns:
+            List of matched peers with similarity scores
+        """
+        candidates = self.peer_database[
+            self.peer_database['company_name'].str.lower() != company_name.lower()
+        ]  # Skip the company itself
+        
+        # Structured scores depend only on (industry, rating, outlook), so
+        # score each distinct combination once
+        profiles = list(zip(candidates['industry'].tolist(), candidates['rating'].tolist(),
+                            candidates['outlook'].tolist()))
+        profile_scores = {
+            profile: self._calculate_match_score(industry, rating, *profile)
+            for profile in set(profiles)
+        }
+        scores = pd.Series([profile_scores[p] for p in profiles], index=candidates.index, dtype=float)
+        
+        # Rationale content similarity is linear in the weighted score, so it is
+        # added per row rather than re-scoring every profile
+        content_scores = pd.Series(0.0, index=candidates.index)
+        similarities = self.content_index.similarities(company_name)
+        if similarities is not None:
+            similarity_by_company = pd.Series(similarities, index=list(self.content_index.company_ids))
+            content_scores = (candidates['company_name'].str.lower()
+                              .map(similarity_by_company).fillna(0.0))
+            scores = scores + self.match_weights.get('content', 0) * content_scores
+        
+        matches = []
+        for idx in scores.nlargest(top_n).index:
+            row = candidates.loc[idx]
+            score = float(scores[idx])
+            matches.append({
+                'company': row['company_name'],
+                'industry': row['industry'],
+                'rating': row['rating'],
+                'agency': row['agency'],
+                'outlook': row['outlook'],
+                'content_similarity': round(float(content_scores[idx]), 2),
+                'match_score': round(score, 2),
+                'match_percentage': round(score * 100, 1)
+            })
+        
+        return matches[:top_n]
+    
+    def _calculate_match_score(self, industry1: str, rating1: str, 
+                               industry2: str, rating2: str, outlook2: str,
+                               content_similarity: float = 0.0) -> float:
+        """Calculate similarity score between two companies"""
+        scores = {}
+        
+        # Industry match
+        industry_match = SequenceMatcher(None, industry1.lower(), industry2.lower()).ratio()
+        scores['industry'] = industry_match
+        
+        # Rating match (proximity in rating hierarchy)
+        rating_diff = abs(RATING_HIERARCHY.get(rating1, 10) - RATING_HIERARCHY.get(rating2, 10))
+        rating_match = max(0, 1 - (rating_diff * 0.05))  # Decay with distance
+        scores['rating'] = rating_match
+        
+        # Outlook bonus
+        scores['outlook'] = 0.5 if outlook2 == 'Positive' else 0.3
+        
+        # Rationale content similarity (cosine over TF-IDF)
+        scores['content'] = content_similarity
+        
+        # Calculate weighted score
+        weighted_score = sum(
+            scores.get(key, 0) * self.match_weights.get(key, 0)
+            for key in self.match_weights.keys()
+        )
+        
+        return min(1.0, weighted_score)
+    
+    def get_peer_analysis(self, company_name: str, industry: str, rating: str) -> Dict:
+        """
+        Get comprehensive peer analysis
+        
+        Args:
+            company_name: Company name
+            industry: Industry sector
+            rating: Credit rating
+            
+        Returns:
+            Dictionary with peer analysis and insights
+        """
+        peers = self.find_peers(company_name, industry, rating, top_n=10)
+        
+        return {
+            'target_company': company_name,
+            'industry': industry,
+            'rating': rating,
+            'peer_count': len(peers),
+            'top_peers': peers[:5],
+            'all_peers': peers,
+            'average_peer_rating': self._get_average_rating([p['rating'] for p in peers]),
+            'better_rated_peers': [p for p in peers if self._is_better_rating(rating, p['rating'])],
+            'worse_rated_peers': [p for p in peers if self._is_worse_rating(rating, p['rating'])]
+        }
+    
+    def _is_better_rating(self, rating1: str, rating2: str) -> bool:
+        """Check if rating2 is better than rating1"""
+        return RATING_HIERARCHY.get(rating2, 20) < RATING_HIERARCHY.get(rating1, 20)
+    
+    def _is_worse_rating(self, rating1: str, rating2: str) -> bool:
+        """Check if rating2 is worse than rating1"""
+        return RATING_HIERARCHY.get(rating2, 20) > RATING_HIERARCHY.get(rating1, 20)
+    
+    def _get_average_rating(self, ratings: List[str]) -> str:
+        """Get average rating from a list of ratings"""
+        if not ratings:
+            return 'N/A'
+        
+        avg_hierarchy = sum(RATING_HIERARCHY.get(r, 10) for r in ratings) / len(ratings)
+        
+        # Find closest rating
+        closest_rating = min(RATING_HIERARCHY.items(), 
+                            key=lambda x: abs(x[1] - avg_hierarchy))[0]
+        
+        return closest_rating
+    
+    def flag_opportunities(self, company_name: str, rating: str, outlook: str,
+                          peers: List[Dict]) -> Dict:
+        """
+        Flag upgrade/downgrade and other opportunities
+        
+        Args:
+            company_name: Company name
+            rating: Current rating
+            outlook: Current outlook
+            peers: List of peer companies
+            
+        Returns:
+            Dictionary with opportunity flags
+        """
+        opportunities = {
+            'company': company_name,
+            'flags': [],
+            'upgrade_potential': False,
+            'downgrade_risk': False,
+            'signal_strength': 'Neutral'
+        }
+        
+        if not peers:
+            return opportunities
+        
+        # Count better/worse rated peers
+        better_peers = [p for p in peers if self._is_better_rating(rating, p['rating'])]
+        worse_peers = [p for p in peers if self._is_worse_rating(rating, p['rating'])]
+        
+        # Upgrade signals
+        if outlook == 'Positive' and len(better_peers) >= 2:
+            opportunities['flags'].append({
+                'type': 'UPGRADE_SIGNAL',
+                'description': f'Positive outlook with {len(better_peers)} better-rated peers',
+                'priority': 'HIGH'
+            })
+            opportunities['upgrade_potential'] = True
+            opportunities['signal_strength'] = 'STRONG'
+        
+        # Downgrade signals
+        if outlook == 'Negative' and len(worse_peers) >= 2:
+            opportunities['flags'].append({
+                'type': 'DOWNGRADE_SIGNAL',
+                'description': f'Negative outlook with {len(worse_peers)} worse-rated peers',
+                'priority': 'HIGH'
+            })
+            opportunities['downgrade_risk'] = True
+            opportunities['signal_strength'] = 'STRONG'
+        
+        # Peer gap analysis
+        if len(better_peers) > len(worse_peers) * 2:
+            opportunities['flags'].append({
+                'type': 'PEER_GAP',
+                'description': 'Company is lagging behind peers',
+                'priority': 'MEDIUM'
+            })
+        
+        return opportunities
+
+
+# Module-level functions for easy usage
+PEER_MATCHER = None
+
+def initialize_peer_matcher(database: pd.DataFrame = None):
+    """Initialize the global peer matcher"""
+    global PEER_MATCHER
+    PEER_MATCHER = PeerMatcher(database)
+
+def attach_search_engine(search_engine):
+    """Feed rationale content from a search engine into peer matching"""
+    if PEER_MATCHER is None:
+        initialize_peer_matcher()
+    PEER_MATCHER.attach_search_engine(search_engine)
+
+def match_peers(company_name: str, industry: str, rating: str, top_n: int = 5):
+    """Find peers for a company"""
+    if PEER_MATCHER is None:
+        initialize_peer_matcher()
+    return PEER_MATCHER.find_peers(company_name, industry, rating, top_n)
+
+def analyze_peers(company_name: str, industry: str, rating: str):
+    """Get comprehensive peer analysis"""
+    if PEER_MATCHER is None:
+        initialize_peer_matcher()
+    return PEER_MATCHER.get_peer_analysis(company_name, industry, rating)
+
+def flag_opportunities(company_name: str, rating: str, outlook: str, peers: List[Dict]):
+    """Flag opportunities and signals"""
+    if PEER_MATCHER is None:
+        initialize_peer_matcher()
+    return PEER_MATCHER.flag_opportunities(company_name, rating, outlook, peers)
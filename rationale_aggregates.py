@@ -0,0 +1,111 @@
+"""
+FINMEN Rationale Aggregates - Versioned, incrementally maintained statistics
+Keeps per-company row indexes and rating/outlook/instrument distributions
+up to date on each append so Streamlit reruns don't rescan the dataset
+"""
+
+import pandas as pd
+from typing import List, Dict, Callable
+from collections import Counter, defaultdict
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RationaleAggregates:
+    """Aggregation layer over the submitted rationales DataFrame"""
+
+    def __init__(self, data: pd.DataFrame = None):
+        """
+        Initialize aggregates, optionally from existing rationale data
+
+        Args:
+            data: DataFrame with the app's rationale columns
+        """
+        self.version = 0
+        self.total_rows = 0
+        # Insertion order doubles as first-seen order, matching Series.unique()
+        self.company_rows: Dict[str, List[int]] = defaultdict(list)
+        self.agency_counts: Counter = Counter()
+        self.rating_counts: Counter = Counter()
+        self.outlook_counts: Counter = Counter()
+        self.instrument_counts: Counter = Counter()
+        # Derived values memoized for the current version only
+        self._cache: Dict = {}
+
+        if data is not None:
+            self.append(data)
+
+    def append(self, rows: pd.DataFrame):
+        """
+        Fold newly appended rows into the aggregates
+
+        Rows must be appended to the underlying DataFrame with a positional
+        (ignore_index=True) index, in the same order as passed here.
+        """
+        for offset, row in enumerate(rows.to_dict('records')):
+            position = self.total_rows + offset
+            self.company_rows[row['Company Name']].append(position)
+            for counts, column in ((self.agency_counts, 'Rating Agency'),
+                                   (self.rating_counts, 'Rating'),
+                                   (self.outlook_counts, 'Outlook'),
+                                   (self.instrument_counts, 'Instrument Type')):
+                if pd.notna(row[column]):
+                    counts[row[column]] += 1
+
+        self.total_rows += len(rows)
+        self.version += 1
+        self._cache.clear()
+
+    def is_current(self, data: pd.DataFrame) -> bool:
+        """Check the aggregates still describe the given DataFrame"""
+        return len(data) == self.total_rows
+
+    def _memoized(self, key, compute: Callable):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def companies(self) -> List[str]:
+        """Companies in first-submitted order"""
+        return list(self.company_rows.keys())
+
+    def company_data(self, data: pd.DataFrame, company: str) -> pd.DataFrame:
+        """Rows for one company, looked up by position instead of a full-column mask"""
+        return data.iloc[self.company_rows.get(company, [])]
+
+    def agency_ratings(self, data: pd.DataFrame, company: str) -> pd.DataFrame:
+        """Latest rating/outlook and update count per agency for a company"""
+        def compute():
+            return self.company_data(data, company).groupby('Rating Agency').agg({
+                'Rating': 'last',
+                'Outlook': 'last',
+                'Rationale_ID': 'count'
+            }).rename(columns={'Rationale_ID': 'Updates'})
+
+        return self._memoized(('agency_ratings', company), compute)
+
+    def _distribution(self, counts: Counter, name: str) -> pd.Series:
+        return pd.Series(dict(counts.most_common()), name=name, dtype='int64')
+
+    def rating_distribution(self) -> pd.Series:
+        """Rating counts sorted by rating label"""
+        return self._memoized('rating', lambda: self._distribution(self.rating_counts, 'count').sort_index())
+
+    def outlook_distribution(self) -> pd.Series:
+        """Outlook counts, most common first"""
+        return self._memoized('outlook', lambda: self._distribution(self.outlook_counts, 'count'))
+
+    def instrument_distribution(self) -> pd.Series:
+        """Instrument type counts, most common first"""
+        return self._memoized('instrument', lambda: self._distribution(self.instrument_counts, 'count'))
+
+    def get_statistics(self) -> Dict:
+        """Summary counts for metrics"""
+        return {
+            'total_rationales': self.total_rows,
+            'unique_companies': len(self.company_rows),
+            'rating_agencies': len(self.agency_counts),
+            'instrument_types': len(self.instrument_counts),
+            'version': self.version
+        }
@@ -1,2 +1,641 @@
 
-"""\nFINMEN Full-Text Search Engine - Real-time search with autocomplete\nIndexing and searching across rationales, companies, and documents\n"""\n\nimport re\nimport time\nfrom typing import List, Dict, Tuple\nfrom collections import defaultdict\nimport logging\nfrom datetime import datetime\n\nlogger = logging.getLogger(__name__)\n\nclass RationalDocument:\n    """Represents an indexed rationale document"""\n    def __init__(self, doc_id: str, company: str, agency: str, rating: str,\n                 content: str, timestamp: str = None):\n        self.doc_id = doc_id\n        self.company = company\n        self.agency = agency\n        self.rating = rating\n        self.content = content\n        self.timestamp = timestamp or datetime.now().isoformat()\n        self.tokens = self._tokenize(content)\n\n    def _tokenize(self, text: str) -> List[str]:\n        """Tokenize and normalize text"""\n        # Convert to lowercase and split on non-alphanumeric\n        words = re.findall(r'\\b\\w+\\b', text.lower())\n        # Remove common stopwords\n        stopwords = {'the', 'a', 'an', 'and', 'or', 'is', 'are', 'was', 'in', 'to', 'of'}\n        return [w for w in words if w not in stopwords]\n\nclass FullTextSearchEngine:\n    """Production-grade full-text search engine"""\n    \n    def __init__(self):\n        self.documents: Dict[str, RationalDocument] = {}\n        self.inverted_index: Dict[str, List[str]] = defaultdict(list)\n        self.company_index: Dict[str, List[str]] = defaultdict(list)\n        self.agency_index: Dict[str, List[str]] = defaultdict(list)\n        self.last_updated = None\n    \n    def index_document(self, doc_id: str, company: str, agency: str, \n                      rating: str, content: str) -> bool:\n        """\n        Index a new document\n        \n        Args:\n            doc_id: Unique document identifier\n            company: Company name\n            agency: Rating agency\n            rating: Credit rating\n            content: Full rationale text\n            \n        Returns:\n            True if successfully indexed\n        """\n        try:\n            doc = RationalDocument(doc_id, company, agency, rating, content)\n            self.documents[doc_id] = doc\n            \n            # Build inverted index for full-text search\n            for token in doc.tokens:\n                if doc_id not in self.inverted_index[token]:\n                    self.inverted_index[token].append(doc_id)\n            \n            # Build company index\n            company_key = company.lower()\n            if doc_id not in self.company_index[company_key]:\n                self.company_index[company_key].append(doc_id)\n            \n            # Build agency index\n            agency_key = agency.lower()\n            if doc_id not in self.agency_index[agency_key]:\n                self.agency_index[agency_key].append(doc_id)\n            \n            self.last_updated = datetime.now().isoformat()\n            logger.info(f'Indexed document {doc_id} for company {company}')\n            return True\n            \n        except Exception as e:\n            logger.error(f'Error indexing document {doc_id}: {str(e)}')\n            return False\n    \n    def search(self, query: str, limit: int = 10, search_type: str = 'all') -> List[Dict]:\n        """\n        Search documents with various strategies\n        \n        Args:\n            query: Search query\n            limit: Maximum results to return\n            search_type: 'all', 'content', 'company', or 'agency'\n            \n        Returns:\n            List of matching documents with relevance scores\n        """\n        query = query.lower().strip()\n        results = []\n        \n        if search_type in ['all', 'company']:\n            # Exact company match\n            if query in self.company_index:\n                for doc_id in self.company_index[query]:\n                    doc = self.documents[doc_id]\n                    results.append({\n                        'doc_id': doc_id,\n                        'company': doc.company,\n                        'agency': doc.agency,\n                        'rating': doc.rating,\n                        'relevance_score': 1.0,\n                        'match_type': 'exact_company',\n                        'snippet': doc.content[:200]\n                    })\n        \n        if search_type in ['all', 'content']:\n            # Full-text search on content\n            query_tokens = query.split()\n            matching_docs = defaultdict(float)\n            \n            for token in query_tokens:\n                if token in self.inverted_index:\n                    for doc_id in self.inverted_index[token]:\n                        matching_docs[doc_id] += 1.0 / len(query_tokens)\n            \n            # Add phrase matching bonus\n            for doc_id, doc in self.documents.items():\n                if query in doc.content.lower():\n                    matching_docs[doc_id] = min(1.0, matching_docs[doc_id] + 0.5)\n            \n            for doc_id, score in matching_docs.items():\n                if doc_id not in [r.get('doc_id') for r in results]:\n                    doc = self.documents[doc_id]\n                    results.append({\n                        'doc_id': doc_id,\n                        'company': doc.company,\n                        'agency': doc.agency,\n                        'rating': doc.rating,\n                        'relevance_score': score,\n                        'match_type': 'content',\n                        'snippet': self._get_context_snippet(doc.content, query)\n                    })\n        \n        # Sort by relevance score\n        results.sort(key=lambda x: x['relevance_score'], reverse=True)\n        \n        return results[:limit]\n    \n    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:\n        """\n        Get autocomplete suggestions\n        \n        Args:\n            prefix: Search prefix\n            limit: Maximum suggestions\n            \n        Returns:\n            List of suggestions\n        """\n        prefix = prefix.lower().strip()\n        suggestions = []\n        \n        # Company name completions\n        for company_key in self.company_index.keys():\n            if company_key.startswith(prefix):\n                doc_id = self.company_index[company_key][0]\n                company = self.documents[doc_id].company\n                if company not in suggestions:\n                    suggestions.append(company)\n        \n        # Token completions\n        for token in self.inverted_index.keys():\n            if token.startswith(prefix):\n                if token not in suggestions:\n                    suggestions.append(token)\n        \n        return suggestions[:limit]\n    \n    def advanced_search(self, filters: Dict) -> List[Dict]:\n        """\n        Advanced search with filters\n        \n        Args:\n            filters: Dictionary with keys: query, agency, company, rating, date_from, date_to\n            \n        Returns:\n            Filtered search results\n        """\n        results = []\n        \n        for doc_id, doc in self.documents.items():\n            match = True\n            \n            # Apply text search filter\n            if 'query' in filters and filters['query']:\n                search_results = self.search(filters['query'], limit=1000)\n                if doc_id not in [r['doc_id'] for r in search_results]:\n                    match = False\n            \n            # Apply agency filter\n            if match and 'agency' in filters and filters['agency']:\n                if doc.agency.lower() != filters['agency'].lower():\n                    match = False\n            \n            # Apply company filter\n            if match and 'company' in filters and filters['company']:\n                if doc.company.lower() != filters['company'].lower():\n                    match = False\n            \n            # Apply rating filter\n            if match and 'rating' in filters and filters['rating']:\n                if doc.rating != filters['rating']:\n                    match = False\n            \n            if match:\n                results.append({\n                    'doc_id': doc_id,\n                    'company': doc.company,\n                    'agency': doc.agency,\n                    'rating': doc.rating,\n                    'timestamp': doc.timestamp,\n                    'snippet': doc.content[:200]\n                })\n        \n        return results\n    \n    def _get_context_snippet(self, text: str, query: str, context_length: int = 100) -> str:\n        """Get text snippet with query in context"""\n        query_lower = query.lower()\n        text_lower = text.lower()\n        \n        idx = text_lower.find(query_lower)\n        if idx == -1:\n            return text[:200]\n        \n        start = max(0, idx - context_length)\n        end = min(len(text), idx + len(query) + context_length)\n        \n        snippet = text[start:end]\n        if start > 0:\n            snippet = '...' + snippet\n        if end < len(text):\n            snippet = snippet + '...'\n        \n        return snippet\n    \n    def get_statistics(self) -> Dict:\n        """Get search engine statistics"""\n        return {\n            'total_documents': len(self.documents),\n            'total_tokens': len(self.inverted_index),\n            'total_companies': len(self.company_index),\n            'total_agencies': len(self.agency_index),\n            'last_updated': self.last_updated,\n            'memory_usage_estimate': f'{len(self.documents) * 5} KB'  # Rough estimate\n        }\n    \n    def clear_index(self):\n        """Clear all indexes"""\n        self.documents.clear()\n        self.inverted_index.clear()\n        self.company_index.clear()\n        self.agency_index.clear()\n        self.last_updated = None\n        logger.info('Search index cleared')\n\n\n# Global search engine instance\nSEARCH_ENGINE = None\n\ndef initialize_search_engine():\n    """Initialize the global search engine"""\n    global SEARCH_ENGINE\n    SEARCH_ENGINE = FullTextSearchEngine()\n\ndef index_document(doc_id: str, company: str, agency: str, rating: str, content: str):\n    """Index a document"""\n    if SEARCH_ENGINE is None:\n        initialize_search_engine()\n    return SEARCH_ENGINE.index_document(doc_id, company, agency, rating, content)\n\ndef search(query: str, limit: int = 10) -> List[Dict]:\n    """Search documents"""\n    if SEARCH_ENGINE is None:\n        initialize_search_engine()\n    return SEARCH_ENGINE.search(query, limit)\n\ndef autocomplete(prefix: str, limit: int = 10) -> List[str]:\n    """Get autocomplete suggestions"""\n    if SEARCH_ENGINE is None:\n        initialize_search_engine()\n    return SEARCH_ENGINE.autocomplete(prefix, limit)\n\ndef advanced_search(filters: Dict) -> List[Dict]:\n    """Perform advanced search with filters"""\n    if SEARCH_ENGINE is None:\n        initialize_search_engine()\n    return SEARCH_ENGINE.advanced_search(filters)\n
+"""
+FINMEN Full-Text Search Engine - Real-time search with autocomplete
+Indexing and searching across rationales, companies, and documents
+"""
+
+import re
+import time
+import zlib
+from typing import List, Dict, Tuple, Optional, Callable
+from collections import defaultdict
+from difflib import SequenceMatcher
+import logging
+from datetime import datetime
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _content_delta(base: str, text: str) -> List:
+    """
+    Encode text as a word-level delta against a base text
+
+    Spans shared with the base are stored as (start, end) character offsets
+    into the base; everything else is stored as literal strings.
+    """
+    base_parts = re.findall(r'^\s+|\S+\s*', base)
+    parts = re.findall(r'^\s+|\S+\s*', text)
+    offsets = [0]
+    for part in base_parts:
+        offsets.append(offsets[-1] + len(part))
+
+    delta = []
+    matcher = SequenceMatcher(None, base_parts, parts, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append((offsets[i1], offsets[i2]))
+        elif j2 > j1:
+            delta.append(''.join(parts[j1:j2]))
+    return delta
+
+
+def _apply_content_delta(base: str, delta: List) -> str:
+    """Rebuild text from a base text and a delta produced by _content_delta"""
+    return ''.join(op if isinstance(op, str) else base[op[0]:op[1]] for op in delta)
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with LSH banding for near-duplicate rationale lookup
+
+    Rationales are shingled into overlapping token n-grams (numbers collapsed
+    so re-issues differing only in dates and amounts still line up). Each
+    signature is split into bands; documents sharing any band bucket become
+    candidates and are verified against the estimated Jaccard similarity.
+    """
+
+    _MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+    _MAX_HASH = np.uint64((1 << 32) - 1)
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, threshold: float = 0.8,
+                 shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands != 0:
+            raise ValueError('num_perm must be divisible by bands')
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self.signatures: Dict[str, np.ndarray] = {}
+        self.buckets: List[Dict[bytes, List[str]]] = [defaultdict(list) for _ in range(bands)]
+
+    def _shingles(self, tokens: List[str]) -> set:
+        """Build the set of token n-gram shingles"""
+        normalized = ['#' if t.isdigit() else t for t in tokens]
+        k = self.shingle_size
+        if len(normalized) <= k:
+            return {' '.join(normalized)} if normalized else set()
+        return {' '.join(normalized[i:i + k]) for i in range(len(normalized) - k + 1)}
+
+    def signature(self, tokens: List[str]) -> Optional[np.ndarray]:
+        """Compute the MinHash signature of a token list (None if empty)"""
+        shingles = self._shingles(tokens)
+        if not shingles:
+            return None
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in shingles], dtype=np.uint64)
+        permuted = (np.outer(hashes, self._a) + self._b) % self._MERSENNE_PRIME & self._MAX_HASH
+        return permuted.min(axis=0)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def insert(self, key: str, signature: np.ndarray):
+        """Add a signature to the LSH buckets"""
+        self.signatures[key] = signature
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band][band_key].append(key)
+
+    def remove(self, key: str):
+        """Remove a signature from the LSH buckets"""
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band]
+            bucket[band_key].remove(key)
+            if not bucket[band_key]:
+                del bucket[band_key]
+
+    def query(self, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed signature
+
+        Returns:
+            (key, estimated Jaccard similarity) of the best match at or above
+            the threshold, or None
+        """
+        candidates = set()
+        for band, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band].get(band_key, ()))
+
+        best = None
+        for key in candidates:
+            similarity = float(np.mean(self.signatures[key] == signature))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (key, similarity)
+        return best
+
+    def clear(self):
+        """Remove all signatures"""
+        self.signatures.clear()
+        for bucket in self.buckets:
+            bucket.clear()
+
+
+class RationalDocument:
+    """Represents an indexed rationale document"""
+    def __init__(self, doc_id: str, company: str, agency: str, rating: str,
+                 content: str, timestamp: str = None):
+        self.doc_id = doc_id
+        self.company = company
+        self.agency = agency
+        self.rating = rating
+        self._content = content
+        self.timestamp = timestamp or datetime.now().isoformat()
+        self.tokens = self._tokenize(content)
+        # Near-duplicate cluster this document belongs to (its representative's doc_id)
+        self.cluster_id = doc_id
+        self.base: Optional['RationalDocument'] = None
+        self.delta: Optional[List] = None
+        # Base tokens missing from this document, excluded from inherited postings
+        self.removed_tokens: set = set()
+
+    @property
+    def content(self) -> str:
+        """Full rationale text, rebuilt from the base document for near-duplicates"""
+        if self.base is None:
+            return self._content
+        return _apply_content_delta(self.base.content, self.delta)
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.base is not None
+
+    def store_as_delta(self, base: 'RationalDocument'):
+        """Store content as a delta against a near-duplicate base document"""
+        self.delta = _content_delta(base.content, self._content)
+        self.removed_tokens = set(base.tokens) - set(self.tokens)
+        self.base = base
+        self.cluster_id = base.doc_id
+        self._content = None
+
+    def _tokenize(self, text: str) -> List[str]:
+        """Tokenize and normalize text"""
+        # Convert to lowercase and split on non-alphanumeric
+        words = re.findall(r'\b\w+\b', text.lower())
+        # Remove common stopwords
+        stopwords = {'the', 'a', 'an', 'and', 'or', 'is', 'are', 'was', 'in', 'to', 'of'}
+        return [w for w in words if w not in stopwords]
+
+class FullTextSearchEngine:
+    """Production-grade full-text search engine"""
+    
+    def __init__(self):
+        self.documents: Dict[str, RationalDocument] = {}
+        self.inverted_index: Dict[str, List[str]] = defaultdict(list)
+        self.company_index: Dict[str, List[str]] = defaultdict(list)
+        self.agency_index: Dict[str, List[str]] = defaultdict(list)
+        # Near-duplicate clusters: representative doc_id -> member doc_ids
+        self.clusters: Dict[str, List[str]] = defaultdict(list)
+        self.dedup_index = MinHashLSH()
+        # Callbacks notified with each newly indexed RationalDocument
+        self.index_listeners: List[Callable[[RationalDocument], None]] = []
+        # Callbacks notified with a dissolved cluster id, or None when the index is cleared
+        self.invalidation_listeners: List[Callable[[Optional[str]], None]] = []
+        self.last_updated = None
+    
+    def add_index_listener(self, listener: Callable[[RationalDocument], None]):
+        """Register a callback invoked after each document is indexed"""
+        self.index_listeners.append(listener)
+    
+    def add_invalidation_listener(self, listener: Callable[[Optional[str]], None]):
+        """
+        Register a callback for state derived from clusters or documents
+        
+        The callback receives a cluster id when that near-duplicate cluster is
+        dissolved (its representative was re-indexed), or None when the whole
+        index is cleared.
+        """
+        self.invalidation_listeners.append(listener)
+    
+    def index_document(self, doc_id: str, company: str, agency: str, 
+                      rating: str, content: str) -> bool:
+        """
+        Index a new document
+        
+        Args:
+            doc_id: Unique document identifier
+            company: Company name
+            agency: Rating agency
+            rating: Credit rating
+            content: Full rationale text
+            
+        Returns:
+            True if successfully indexed
+        """
+        try:
+            orphans = self._unlink_document(doc_id) if doc_id in self.documents else []
+            
+            doc = RationalDocument(doc_id, company, agency, rating, content)
+            index_tokens = doc.tokens
+            
+            # Near-duplicates are stored as a delta against their cluster
+            # representative and only post tokens the representative lacks
+            signature = self.dedup_index.signature(doc.tokens)
+            match = self.dedup_index.query(signature) if signature is not None else None
+            if match and match[0] != doc_id:
+                base = self.documents[match[0]]
+                doc.store_as_delta(base)
+                base_tokens = set(base.tokens)
+                index_tokens = [t for t in dict.fromkeys(doc.tokens) if t not in base_tokens]
+                logger.info(f'Document {doc_id} is a near-duplicate of {base.doc_id} '
+                            f'(similarity {match[1]:.2f})')
+            elif signature is not None:
+                self.dedup_index.insert(doc_id, signature)
+            
+            self.documents[doc_id] = doc
+            if doc_id not in self.clusters[doc.cluster_id]:
+                self.clusters[doc.cluster_id].append(doc_id)
+            
+            # Build inverted index for full-text search
+            for token in index_tokens:
+                if doc_id not in self.inverted_index[token]:
+                    self.inverted_index[token].append(doc_id)
+            
+            # Build company index
+            company_key = company.lower()
+            if doc_id not in self.company_index[company_key]:
+                self.company_index[company_key].append(doc_id)
+            
+            # Build agency index
+            agency_key = agency.lower()
+            if doc_id not in self.agency_index[agency_key]:
+                self.agency_index[agency_key].append(doc_id)
+            
+            self._notify_listeners(doc)
+            
+            self.last_updated = datetime.now().isoformat()
+            logger.info(f'Indexed document {doc_id} for company {company}')
+            
+            # Former cluster members are re-clustered against the new state
+            for orphan_id, orphan_company, orphan_agency, orphan_rating, orphan_content in orphans:
+                self.index_document(orphan_id, orphan_company, orphan_agency,
+                                    orphan_rating, orphan_content)
+            return True
+            
+        except Exception as e:
+            logger.error(f'Error indexing document {doc_id}: {str(e)}')
+            return False
+    
+    def _notify_listeners(self, doc: RationalDocument):
+        """Run index listeners; a failing listener doesn't fail the indexing"""
+        for listener in self.index_listeners:
+            try:
+                listener(doc)
+            except Exception as e:
+                logger.error(f'Index listener failed for document {doc.doc_id}: {str(e)}')
+    
+    def _notify_invalidation(self, cluster_id: Optional[str]):
+        """Run invalidation listeners; a failing listener is logged and skipped"""
+        for listener in self.invalidation_listeners:
+            try:
+                listener(cluster_id)
+            except Exception as e:
+                logger.error(f'Invalidation listener failed for cluster {cluster_id}: {str(e)}')
+    
+    def _unlink_document(self, doc_id: str) -> List[Tuple[str, str, str, str, str]]:
+        """
+        Remove an indexed document's postings and near-duplicate state
+        
+        Args:
+            doc_id: Document about to be re-indexed
+            
+        Returns:
+            (doc_id, company, agency, rating, content) of cluster members that
+            were deltas against this document and must be re-indexed
+        """
+        old = self.documents[doc_id]
+        self._remove_postings(old)
+        
+        members = self.clusters.pop(old.cluster_id, [])
+        orphans = []
+        if old.is_duplicate:
+            members.remove(doc_id)
+            if members:
+                self.clusters[old.cluster_id] = members
+        else:
+            self.dedup_index.remove(doc_id)
+            self._notify_invalidation(doc_id)
+            for member_id in members:
+                if member_id != doc_id:
+                    member = self.documents.pop(member_id)
+                    self._remove_postings(member)
+                    orphans.append((member_id, member.company, member.agency,
+                                    member.rating, member.content))
+        
+        del self.documents[doc_id]
+        return orphans
+    
+    def _remove_postings(self, doc: RationalDocument):
+        """Remove a document from the inverted, company and agency indexes"""
+        for token in set(doc.tokens):
+            postings = self.inverted_index.get(token)
+            if postings and doc.doc_id in postings:
+                postings.remove(doc.doc_id)
+                if not postings:
+                    del self.inverted_index[token]
+        
+        for index, key in ((self.company_index, doc.company.lower()),
+                           (self.agency_index, doc.agency.lower())):
+            if doc.doc_id in index.get(key, []):
+                index[key].remove(doc.doc_id)
+                if not index[key]:
+                    del index[key]
+    
+    def search(self, query: str, limit: int = 10, search_type: str = 'all',
+               collapse_duplicates: bool = True) -> List[Dict]:
+        """
+        Search documents with various strategies
+        
+        Args:
+            query: Search query
+            limit: Maximum results to return
+            search_type: 'all', 'content', 'company', or 'agency'
+            collapse_duplicates: Return one result per near-duplicate cluster and company
+            
+        Returns:
+            List of matching documents with relevance scores
+        """
+        query = query.lower().strip()
+        results = []
+        
+        if search_type in ['all', 'company']:
+            # Exact company match
+            if query in self.company_index:
+                for doc_id in self.company_index[query]:
+                    doc = self.documents[doc_id]
+                    results.append({
+                        'doc_id': doc_id,
+                        'company': doc.company,
+                        'agency': doc.agency,
+                        'rating': doc.rating,
+                        'relevance_score': 1.0,
+                        'match_type': 'exact_company',
+                        'snippet': doc.content[:200]
+                    })
+        
+        if search_type in ['all', 'content']:
+            # Full-text search on content
+            query_tokens = query.split()
+            matching_docs = defaultdict(float)
+            
+            for token in query_tokens:
+                if token in self.inverted_index:
+                    token_docs = set()
+                    for doc_id in self.inverted_index[token]:
+                        # Cluster members inherit their representative's postings,
+                        # except for tokens they dropped from its text
+                        if self.documents[doc_id].is_duplicate:
+                            token_docs.add(doc_id)
+                        else:
+                            token_docs.update(
+                                member for member in self.clusters[doc_id]
+                                if token not in self.documents[member].removed_tokens
+                            )
+                    for doc_id in token_docs:
+                        matching_docs[doc_id] += 1.0 / len(query_tokens)
+            
+            # Add phrase matching bonus
+            for doc_id, doc in self.documents.items():
+                if query in doc.content.lower():
+                    matching_docs[doc_id] = min(1.0, matching_docs[doc_id] + 0.5)
+            
+            for doc_id, score in matching_docs.items():
+                if doc_id not in [r.get('doc_id') for r in results]:
+                    doc = self.documents[doc_id]
+                    results.append({
+                        'doc_id': doc_id,
+                        'company': doc.company,
+                        'agency': doc.agency,
+                        'rating': doc.rating,
+                        'relevance_score': score,
+                        'match_type': 'content',
+                        'snippet': self._get_context_snippet(doc.content, query)
+                    })
+        
+        # Sort by relevance score
+        results.sort(key=lambda x: x['relevance_score'], reverse=True)
+        
+        if collapse_duplicates:
+            results = self._collapse_duplicates(results)
+        
+        return results[:limit]
+    
+    def _collapse_duplicates(self, results: List[Dict]) -> List[Dict]:
+        """
+        Keep the best-scoring result per near-duplicate cluster and company
+
+        Clusters are built from content alone, so issuers sharing boilerplate
+        rationales stay separate results. Only members that matched the query
+        are listed as duplicates.
+        """
+        groups: Dict[Tuple[str, str], Dict] = {}
+        collapsed = []
+        
+        for result in results:
+            doc = self.documents[result['doc_id']]
+            group = (doc.cluster_id, doc.company.lower())
+            if group in groups:
+                groups[group]['duplicates'].append(result['doc_id'])
+                continue
+            
+            result['duplicates'] = []
+            groups[group] = result
+            collapsed.append(result)
+        
+        for result in collapsed:
+            result['duplicate_count'] = len(result['duplicates'])
+        
+        return collapsed
+    
+    def get_cluster_id(self, doc_id: str) -> Optional[str]:
+        """Get the near-duplicate cluster (representative doc_id) of a document"""
+        doc = self.documents.get(doc_id)
+        return doc.cluster_id if doc else None
+    
+    def find_near_duplicates(self, content: str) -> List[str]:
+        """
+        Find indexed documents that are near-duplicates of the given text
+        
+        Args:
+            content: Rationale text
+            
+        Returns:
+            Doc ids of the matching near-duplicate cluster (empty if none)
+        """
+        tokens = RationalDocument('', '', '', '', content).tokens
+        signature = self.dedup_index.signature(tokens)
+        if signature is None:
+            return []
+        match = self.dedup_index.query(signature)
+        return list(self.clusters[match[0]]) if match else []
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Get autocomplete suggestions
+        
+        Args:
+            prefix: Search prefix
+            limit: Maximum suggestions
+            
+        Returns:
+            List of suggestions
+        """
+        prefix = prefix.lower().strip()
+        suggestions = []
+        
+        # Company name completions
+        for company_key in self.company_index.keys():
+            if company_key.startswith(prefix):
+                doc_id = self.company_index[company_key][0]
+                company = self.documents[doc_id].company
+                if company not in suggestions:
+                    suggestions.append(company)
+        
+        # Token completions
+        for token in self.inverted_index.keys():
+            if token.startswith(prefix):
+                if token not in suggestions:
+                    suggestions.append(token)
+        
+        return suggestions[:limit]
+    
+    def advanced_search(self, filters: Dict) -> List[Dict]:
+        """
+        Advanced search with filters
+        
+        Args:
+            filters: Dictionary with keys: query, agency, company, rating, date_from, date_to
+            
+        Returns:
+            Filtered search results
+        """
+        results = []
+        
+        for doc_id, doc in self.documents.items():
+            match = True
+            
+            # Apply text search filter
+            if 'query' in filters and filters['query']:
+                search_results = self.search(filters['query'], limit=1000,
+                                             collapse_duplicates=False)
+                if doc_id not in [r['doc_id'] for r in search_results]:
+                    match = False
+            
+            # Apply agency filter
+            if match and 'agency' in filters and filters['agency']:
+                if doc.agency.lower() != filters['agency'].lower():
+                    match = False
+            
+            # Apply company filter
+            if match and 'company' in filters and filters['company']:
+                if doc.company.lower() != filters['company'].lower():
+                    match = False
+            
+            # Apply rating filter
+            if match and 'rating' in filters and filters['rating']:
+                if doc.rating != filters['rating']:
+                    match = False
+            
+            if match:
+                results.append({
+                    'doc_id': doc_id,
+                    'company': doc.company,
+                    'agency': doc.agency,
+                    'rating': doc.rating,
+                    'timestamp': doc.timestamp,
+                    'snippet': doc.content[:200]
+                })
+        
+        return results
+    
+    def _get_context_snippet(self, text: str, query: str, context_length: int = 100) -> str:
+        """Get text snippet with query in context"""
+        query_lower = query.lower()
+        text_lower = text.lower()
+        
+        idx = text_lower.find(query_lower)
+        if idx == -1:
+            return text[:200]
+        
+        start = max(0, idx - context_length)
+        end = min(len(text), idx + len(query) + context_length)
+        
+        snippet = text[start:end]
+        if start > 0:
+            snippet = '...' + snippet
+        if end < len(text):
+            snippet = snippet + '...'
+        
+        return snippet
+    
+    def get_statistics(self) -> Dict:
+        """Get search engine statistics"""
+        return {
+            'total_documents': len(self.documents),
+            'total_tokens': len(self.inverted_index),
+            'total_companies': len(self.company_index),
+            'total_agencies': len(self.agency_index),
+            'near_duplicate_clusters': len(self.clusters),
+            'duplicate_documents': len(self.documents) - len(self.clusters),
+            'last_updated': self.last_updated,
+            'memory_usage_estimate': f'{len(self.documents) * 5} KB'  # Rough estimate
+        }
+    
+    def clear_index(self):
+        """Clear all indexes"""
+        self.documents.clear()
+        self.inverted_index.clear()
+        self.company_index.clear()
+        self.agency_index.clear()
+        self.clusters.clear()
+        self.dedup_index.clear()
+        self.last_updated = None
+        self._notify_invalidation(None)
+        logger.info('Search index cleared')
+
+
+# Global search engine instance
+SEARCH_ENGINE = None
+
+def initialize_search_engine():
+    """Initialize the global search engine"""
+    global SEARCH_ENGINE
+    SEARCH_ENGINE = FullTextSearchEngine()
+
+def index_document(doc_id: str, company: str, agency: str, rating: str, content: str):
+    """Index a document"""
+    if SEARCH_ENGINE is None:
+        initialize_search_engine()
+    return SEARCH_ENGINE.index_document(doc_id, company, agency, rating, content)
+
+def search(query: str, limit: int = 10) -> List[Dict]:
+    """Search documents"""
+    if SEARCH_ENGINE is None:
+        initialize_search_engine()
+    return SEARCH_ENGINE.search(query, limit)
+
+def autocomplete(prefix: str, limit: int = 10) -> List[str]:
+    """Get autocomplete suggestions"""
+    if SEARCH_ENGINE is None:
+        initialize_search_engine()
+    return SEARCH_ENGINE.autocomplete(prefix, limit)
+
+def find_near_duplicates(content: str) -> List[str]:
+    """Find the near-duplicate cluster of a rationale"""
+    if SEARCH_ENGINE is None:
+        initialize_search_engine()
+    return SEARCH_ENGINE.find_near_duplicates(content)
+
+def advanced_search(filters: Dict) -> List[Dict]:
+    """Perform advanced search with filters"""
+    if SEARCH_ENGINE is None:
+        initialize_search_engine()
+    return SEARCH_ENGINE.advanced_search(filters)
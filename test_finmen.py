@@ -129,6 +129,153 @@ for config in config_files:
     else:
         print_test(f"Config File: {config}", "WARN", f"Optional: {config} not found")
 
+# TEST 8: Near-Duplicate Rationale Detection
+print_header("TEST 8: Near-Duplicate Rationale Detection")
+try:
+    from search_engine import FullTextSearchEngine
+    engine = FullTextSearchEngine()
+    base_text = ("The rating reflects the strong market position of the company in residential "
+                 "real estate, healthy collections, low leverage and experienced management. "
+                 "Liquidity remains adequate with unencumbered cash balances and undrawn lines. ")
+    reissue = base_text + "Rating assigned on 14 March 2024 for Rs 250 crore debentures."
+    engine.index_document('RAT-1', 'Ashiana Housing', 'ICRA', 'A+',
+                          base_text + "Rating assigned on 2 June 2023 for Rs 150 crore debentures.")
+    engine.index_document('RAT-2', 'Ashiana Housing', 'ICRA', 'A+', reissue)
+
+    if engine.get_cluster_id('RAT-2') == 'RAT-1' and engine.documents['RAT-2'].content == reissue:
+        print_test("Re-issued Rationale Stored as Delta", "PASS")
+    else:
+        print_test("Re-issued Rationale Stored as Delta", "FAIL", "RAT-2 not clustered with RAT-1")
+
+    engine.index_document('RAT-3', 'Lodha Group', 'ICRA', 'A+',
+                          base_text + "Rating assigned on 9 May 2024 for Rs 300 crore debentures.")
+    results = engine.search('collections')
+    companies = sorted(r['company'] for r in results)
+    if (companies == ['Ashiana Housing', 'Lodha Group']
+            and {r['company']: r['duplicate_count'] for r in results} == {'Ashiana Housing': 1, 'Lodha Group': 0}):
+        print_test("Duplicates Collapsed per Company in Search", "PASS")
+    else:
+        print_test("Duplicates Collapsed per Company in Search", "FAIL", f"Got {companies}")
+
+    matched_ids = [r['doc_id'] for r in engine.search('june', collapse_duplicates=False)]
+    filtered_ids = [r['doc_id'] for r in engine.advanced_search({'query': 'june'})]
+    collapsed = engine.search('june')
+    if (matched_ids == ['RAT-1'] and filtered_ids == ['RAT-1']
+            and [(r['doc_id'], r['duplicates']) for r in collapsed] == [('RAT-1', [])]):
+        print_test("Representative-Only Token Not Inherited", "PASS")
+    else:
+        print_test("Representative-Only Token Not Inherited", "FAIL", f"Got {matched_ids}, {filtered_ids}")
+
+    engine.index_document('RAT-2', 'Ashiana Housing', 'ICRA', 'A+',
+                          "Unrelated rationale on cement kiln capacity and clinker prices.")
+    results = engine.search('collections')
+    if engine.get_cluster_id('RAT-2') == 'RAT-2' and all(r['doc_id'] != 'RAT-2' and not r['duplicates'] for r in results):
+        print_test("Re-indexed Rationale Leaves Old Cluster", "PASS")
+    else:
+        print_test("Re-indexed Rationale Leaves Old Cluster", "FAIL", f"Got {engine.clusters}")
+
+    from ai_analyzer import AIRatingAnalyzer
+    analyzer = AIRatingAnalyzer()
+    analyzer.attach_search_engine(engine)
+    analyzer.analyze_rationale('Ashiana Housing', engine.documents['RAT-1'].content, 'A+',
+                               cluster_id=engine.get_cluster_id('RAT-1'))
+    stressed_text = "Weak liquidity, high leverage and debt burden raise default risk for the group."
+    engine.index_document('RAT-1', 'Ashiana Housing', 'ICRA', 'A+', stressed_text)
+    reanalysis = analyzer.analyze_rationale('Ashiana Housing', stressed_text, 'A+',
+                                            cluster_id=engine.get_cluster_id('RAT-1'))
+    if reanalysis.risks == analyzer.analyze_rationale('Ashiana Housing', stressed_text, 'A+').risks:
+        print_test("Re-indexed Representative Drops Cached Analysis", "PASS")
+    else:
+        print_test("Re-indexed Representative Drops Cached Analysis", "FAIL", f"Got {reanalysis.risks}")
+except Exception as e:
+    print_test("Near-Duplicate Detection", "FAIL", str(e))
+
+# TEST 9: Content-Based Peer Similarity
+print_header("TEST 9: Content-Based Peer Similarity")
+try:
+    from peer_matcher import PeerMatcher, ContentSimilarityIndex
+    from search_engine import FullTextSearchEngine
+    matcher = PeerMatcher()
+    engine = FullTextSearchEngine()
+    matcher.attach_search_engine(engine)
+
+    engine.index_document('RAT-0', 'Kotak Bank', 'CRISIL', 'AAA', "The and of.")
+    if (ContentSimilarityIndex().all_top_k() == {} and matcher.content_index.top_k('Kotak Bank') == []
+            and matcher.find_peers('Kotak Bank', 'Banking', 'AAA', top_n=1)):
+        print_test("Empty Content Index Handled", "PASS")
+    else:
+        print_test("Empty Content Index Handled", "FAIL")
+    engine.index_document('RAT-1', 'Kotak Bank', 'CRISIL', 'AAA',
+                          "Strong CASA deposits, healthy net interest margin and asset quality.")
+    engine.index_document('RAT-2', 'Axis Bank', 'CRISIL', 'AA',
+                          "Granular CASA deposits and stable net interest margin support earnings.")
+    engine.index_document('RAT-3', 'Lodha Group', 'ICRA', 'A+',
+                          "Residential presales and collections in the Mumbai region remain strong.")
+
+    neighbors = matcher.content_index.top_k('Kotak Bank', k=1)
+    if neighbors and neighbors[0][0] == 'Axis Bank':
+        print_test("Incremental TF-IDF Top-K Neighbors", "PASS")
+    else:
+        print_test("Incremental TF-IDF Top-K Neighbors", "FAIL", f"Got {neighbors}")
+
+    peers = matcher.find_peers('Kotak Bank', 'Banking', 'AAA', top_n=1)
+    if peers and peers[0]['company'] == 'Axis Bank' and peers[0]['content_similarity'] > 0:
+        print_test("Content Similarity Blended into Peer Score", "PASS")
+    else:
+        print_test("Content Similarity Blended into Peer Score", "FAIL", f"Got {peers}")
+
+    matcher.attach_search_engine(engine)
+    engine.index_document('RAT-1', 'Kotak Bank', 'CRISIL', 'AAA',
+                          "Strong CASA deposits and healthy asset quality in Mumbai.")
+    engine.index_document('RAT-3', 'Lodha Group', 'ICRA', 'A+',
+                          "Residential presales and collections in Mumbai remain strong.")
+    fresh_matcher = PeerMatcher()
+    fresh_matcher.attach_search_engine(engine)
+
+    def rounded_neighbors(content_index, company):
+        return [(peer, round(score, 6)) for peer, score in content_index.top_k(company, k=3)]
+
+    mismatched = [
+        company for company in ('Kotak Bank', 'Axis Bank', 'Lodha Group')
+        if rounded_neighbors(matcher.content_index, company) != rounded_neighbors(fresh_matcher.content_index, company)
+    ]
+    if not mismatched:
+        print_test("Re-indexing Replaces Rationale Counts", "PASS")
+    else:
+        print_test("Re-indexing Replaces Rationale Counts", "FAIL", f"Neighbors differ for {mismatched}")
+
+    engine.clear_index()
+    if len(matcher.content_index) == 0 and matcher.content_index.top_k('Kotak Bank') == []:
+        print_test("Clearing Engine Clears Content Index", "PASS")
+    else:
+        print_test("Clearing Engine Clears Content Index", "FAIL", f"{len(matcher.content_index)} companies left")
+except Exception as e:
+    print_test("Content-Based Peer Similarity", "FAIL", str(e))
+
+# TEST 10: Rationale Aggregates
+print_header("TEST 10: Rationale Aggregates")
+try:
+    import pandas as pd
+    from rationale_aggregates import RationaleAggregates
+    data = pd.DataFrame({
+        'Rationale_ID': ['RAT-1', 'RAT-2', 'RAT-3'],
+        'Company Name': ['Kotak Bank', 'Lodha Group', 'Kotak Bank'],
+        'Rating Agency': ['CRISIL', 'ICRA', 'ICRA'],
+        'Instrument Type': ['Bond', 'Debenture', 'Bond'],
+        'Rating': ['AAA', 'A+', 'AAA'],
+        'Outlook': ['Stable', 'Positive', 'Stable']
+    })
+    aggregates = RationaleAggregates(data.iloc[:2])
+    aggregates.append(data.iloc[2:])
+
+    if (aggregates.company_data(data, 'Kotak Bank').equals(data[data['Company Name'] == 'Kotak Bank'])
+            and aggregates.outlook_distribution().to_dict() == data['Outlook'].value_counts().to_dict()):
+        print_test("Incremental Aggregates Match Full Recompute", "PASS")
+    else:
+        print_test("Incremental Aggregates Match Full Recompute", "FAIL")
+except Exception as e:
+    print_test("Rationale Aggregates", "FAIL", str(e))
+
 print_summary()
 
 if test_results['failed'] > 0: